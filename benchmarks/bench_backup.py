@@ -0,0 +1,98 @@
+"""Backup / restore benchmark: throughput and peak memory
+
+使い方: python -m benchmarks.bench_backup [transactions] [--json]
+
+Each phase runs in its own process so peak RSS is measured per phase.
+``--json`` adds the single JSON dump this format replaces, for comparison.
+"""
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils.backup import backup, restore
+from utils.storage import SCHEMA
+
+
+def populate(db_path: str, transactions: int, users: int = 100_000) -> None:
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    rng = random.Random(0)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO wallets (user_id, balance, last_daily) VALUES (?, ?, ?)",
+        ((10**17 + u, rng.randint(0, 10**6), None if u % 3 else 1.7e9 + u) for u in range(users)),
+    )
+    now = 1.7e9
+    kinds = ("dice", "slots", "daily", "jackpot")
+    conn.executemany(
+        "INSERT INTO transactions (user_id, delta, kind, interaction_id, created_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            (10**17 + rng.randrange(users), rng.randint(-500, 500), kinds[i & 3], 10**18 + i * 4096, now + i * 0.05)
+            for i in range(transactions)
+        ),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def json_dump(db_path: str, out_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    data = {t: [dict(r) for r in conn.execute(f"SELECT * FROM {t}")] for t in ("wallets", "transactions", "jackpot")}
+    with open(out_path, "w") as out:
+        json.dump(data, out)
+    return sum(len(rows) for rows in data.values())
+
+
+def child(phase: str, src: str, dst: str) -> None:
+    start = time.perf_counter()
+    if phase == "backup":
+        with open(dst, "wb") as out:
+            rows = backup(out, src)
+    elif phase == "restore":
+        with open(src, "rb") as f:
+            rows = restore(f, dst)
+    else:
+        rows = json_dump(src, dst)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"rows": rows, "seconds": elapsed, "peak_mib": peak}))
+
+
+def run(phase: str, src: str, dst: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_backup", "--child", phase, src, dst],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main(transactions: int = 10_000_000, with_json: bool = False) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db, dump, restored = (os.path.join(tmp, n) for n in ("src.db", "dump.c2bk", "restored.db"))
+        t0 = time.perf_counter()
+        populate(db, transactions)
+        print(f"populated {transactions:,} transactions in {time.perf_counter() - t0:.1f}s "
+              f"(db {os.path.getsize(db) / 2**20:.0f} MiB)")
+        phases = [("backup", db, dump), ("restore", dump, restored)]
+        if with_json:
+            phases.append(("json", db, os.path.join(tmp, "dump.json")))
+        for phase, src, dst in phases:
+            r = run(phase, src, dst)
+            print(f"{phase:8} {r['rows'] / r['seconds']:>11,.0f} rows/s  {r['seconds']:6.1f}s  "
+                  f"peak RSS {r['peak_mib']:7.0f} MiB  output {os.path.getsize(dst) / 2**20:6.0f} MiB")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:5])
+    else:
+        args = [a for a in sys.argv[1:] if a != "--json"]
+        main(int(args[0]) if args else 10_000_000, "--json" in sys.argv)
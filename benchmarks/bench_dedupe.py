@@ -0,0 +1,43 @@
+"""Interaction dedupe benchmark: false-positive rate and per-check cost
+
+使い方: python -m benchmarks.bench_dedupe
+"""
+import time
+
+from utils.dedupe import DISCORD_EPOCH_MS, InteractionDeduper
+
+
+def snowflake(ts: float, seq: int) -> int:
+    return (int(ts * 1000) - DISCORD_EPOCH_MS) << 22 | (seq & 0x3FFFFF)
+
+
+def main(inserted: int = 150_000, probes: int = 200_000) -> None:
+    now = [time.time()]
+    dedupe = InteractionDeduper(clock=lambda: now[0])
+    step = dedupe.slice_span * 3 / inserted  # fill three of the four slices
+
+    keys = []
+    start = time.perf_counter()
+    for i in range(inserted):
+        keys.append(snowflake(now[0], i))
+        dedupe.check_and_add(keys[-1])
+        now[0] += step
+    add_cost = (time.perf_counter() - start) / inserted
+
+    sample = keys[::97]
+    replays = sum(not dedupe.check_and_add(key) for key in sample)
+    start = time.perf_counter()
+    false_positives = sum(snowflake(now[0], inserted + i) in dedupe for i in range(probes))
+    check_cost = (time.perf_counter() - start) / probes
+
+    print(f"inserted ids          : {inserted:,}")
+    print(f"replays caught        : {replays:,} / {len(sample):,}")
+    print(f"false-positive rate   : {false_positives / probes:.2e} ({false_positives}/{probes:,})")
+    print(f"check_and_add cost    : {add_cost * 1e6:.2f} µs")
+    print(f"miss (LRU + bloom)    : {check_cost * 1e6:.2f} µs")
+    bloom_bytes = sum(len(b._bits) for b in dedupe._slices)
+    print(f"bloom memory          : {bloom_bytes / 1024:.0f} KiB (fixed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Dice table benchmark: batched round settlement vs per-player settlement
+
+使い方: python -m benchmarks.bench_table
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from utils.storage import WalletStore
+from utils.table import TableBet, TableRound
+
+
+def build_round(players: int, rng: random.Random) -> TableRound:
+    table = TableRound(channel_id=1, closes_at=0.0)
+    for user_id in range(players):
+        table.add(TableBet(user_id, f"player{user_id}", rng.choice(("over", "under")), rng.randint(1, 500)))
+    return table
+
+
+async def batched(store: WalletStore, table: TableRound) -> None:
+    await store.run("credit_batch", "dice_table", table.resolve())
+    table.render()
+
+
+async def per_player(store: WalletStore, table: TableRound) -> None:
+    for user_id, payout, _ in table.resolve():
+        await store.run("apply", user_id, payout, "dice_table")
+
+
+async def measure(name: str, settle, players: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = WalletStore(os.path.join(tmp, "bench.db"))
+        rng = random.Random(0)
+        timings = []
+        for _ in range(rounds):
+            table = build_round(players, rng)
+            start = time.perf_counter()
+            await settle(store, table)
+            timings.append(time.perf_counter() - start)
+        store.close()
+    timings.sort()
+    print(f"{name:12} median {timings[len(timings) // 2] * 1e3:8.1f} ms  "
+          f"round trips/round {store.round_trips / rounds:7.1f}")
+
+
+async def main(players: int = 1_000, rounds: int = 20) -> None:
+    print(f"{players:,}-player rounds, {rounds} rounds each")
+    await measure("batched", batched, players, rounds)
+    await measure("per-player", per_player, players, rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
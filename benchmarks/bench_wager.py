@@ -0,0 +1,55 @@
+"""Wager settlement benchmark: read-then-write vs single atomic settle
+
+使い方: python -m benchmarks.bench_wager
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from utils.storage import InsufficientFunds, WalletStore
+
+
+async def read_then_write(store: WalletStore, user_id: int, bet: int, payout: int) -> None:
+    balance = await store.run("get_balance", user_id)
+    if balance >= bet:
+        await store.run("apply", user_id, payout - bet, "dice")
+
+
+async def atomic_settle(store: WalletStore, user_id: int, bet: int, payout: int) -> None:
+    try:
+        await store.run("settle_wager", user_id, bet, payout, "dice")
+    except InsufficientFunds:
+        pass
+
+
+async def measure(name: str, play, bets: int, users: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = WalletStore(os.path.join(tmp, "bench.db"))
+        for user_id in range(users):
+            store.apply(user_id, 1_000_000, "seed")
+        rng = random.Random(0)
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(bets):
+            bet = rng.randint(1, 100)
+            t0 = time.perf_counter()
+            await play(store, rng.randrange(users), bet, bet * 2 if rng.random() < 0.5 else 0)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        store.close()
+    latencies.sort()
+    print(
+        f"{name:16} round trips/bet {store.round_trips / bets:.2f}  "
+        f"mean {elapsed / bets * 1e6:7.1f} µs  p99 {latencies[int(bets * 0.99)] * 1e6:7.1f} µs"
+    )
+
+
+async def main(bets: int = 5_000, users: int = 1_000) -> None:
+    await measure("read-then-write", read_then_write, bets, users)
+    await measure("atomic settle", atomic_settle, bets, users)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
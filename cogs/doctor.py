@@ -11,6 +11,7 @@ import os
 import asyncio
 import logging
 import importlib
+from collections import Counter
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
@@ -197,6 +198,33 @@ class BotDoctorCog(commands.Cog, name="Bot Doctor"):
         except Exception as e:
             return DiagnosticResult("イベントループ", "warn", f"チェック中にエラー: {e}")
 
+    def _check_response_paths(self) -> DiagnosticResult:
+        """インタラクション応答の経路と期限切れのチェック"""
+        responder = getattr(self.bot, "responder", None)
+        if responder is None:
+            return DiagnosticResult("応答レイテンシ", "ok", "応答の記録はまだありません ✓")
+        totals = Counter()
+        for counts in responder.summary().values():
+            totals.update(counts)
+        summary = (
+            f"即時応答 {totals['direct']} / 事前defer {totals['deferred']} / "
+            f"遅延defer {totals['late_defer']} / 期限切れ {totals['missed']} / 失敗 {totals['failed']}"
+        )
+        if totals["missed"]:
+            return DiagnosticResult(
+                "応答レイテンシ", "warn",
+                f"3秒の応答期限に間に合わなかったインタラクションがあります。\n{summary}",
+                "データベース (`DATABASE_PATH`) を置いているディスクが遅くないか、"
+                "Bot のホストが過負荷になっていないか確認してください。"
+            )
+        if totals["failed"]:
+            return DiagnosticResult(
+                "応答レイテンシ", "warn",
+                f"処理中にエラーになったコマンドがあります。\n{summary}",
+                "ログのトレースバックを確認してください。"
+            )
+        return DiagnosticResult("応答レイテンシ", "ok", f"{summary} ✓")
+
     # ──────────────────────────────────────────────
     # 全診断実行
     # ──────────────────────────────────────────────
@@ -212,6 +240,7 @@ class BotDoctorCog(commands.Cog, name="Bot Doctor"):
             self._check_permissions,
             self._check_slash_commands,
             self._check_event_loop_health,
+            self._check_response_paths,
         ]
         results = []
         for check in checks:
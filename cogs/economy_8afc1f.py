@@ -1,36 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 from typing import Optional
 
+from utils.analytics import CasinoAnalytics
+from utils.helpers import create_embed, format_error
+from utils.respond import get_responder
+from utils.storage import DuplicateInteraction, get_store
+
+DAILY_AMOUNT = 500
+DAILY_COOLDOWN = 24 * 60 * 60
+
 class Economy8Afc1FCog(commands.Cog):
     """Economy system for LuckyDiceCasino."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.store = get_store(bot)
+        self.responder = get_responder(bot)
+        self.analytics = CasinoAnalytics(self.store.path)
 
     @app_commands.command(name="daily", description="Receive your daily bonus of 500 coins.")
     async def daily(self, interaction: discord.Interaction):
-        # TODO: Implement daily reward logic
-        # - Check if the user has already claimed their reward in the last 24 hours
-        # - If eligible, add 500 coins to their balance
-        # - Update the last_claimed timestamp in the database
-        # - Send a success embed with the new balance and a countdown to the next claim
-        # - If not eligible, send an error embed showing the remaining cooldown time
-        pass
+        async def work():
+            try:
+                claimed, balance, next_claim = await self.store.run(
+                    "claim_daily", interaction.user.id, DAILY_AMOUNT, DAILY_COOLDOWN, interaction.id
+                )
+            except DuplicateInteraction:
+                return {"embed": format_error("This command was already processed."), "ephemeral": True}
+            if not claimed:
+                return {
+                    "embed": format_error(f"You already claimed today. Next claim <t:{int(next_claim)}:R>."),
+                    "ephemeral": True,
+                }
+            embed = create_embed(
+                "🎁 Daily Bonus",
+                f"You received **{DAILY_AMOUNT:,}** coins!\nBalance: **{balance:,}** coins",
+                discord.Color.gold(),
+            )
+            embed.add_field(name="Next claim", value=f"<t:{int(next_claim)}:R>")
+            return {"embed": embed}
+
+        await self.responder.send(interaction, "daily", work)
 
     @app_commands.command(name="balance", description="Check your current coin balance.")
     @app_commands.describe(user="The user whose balance you want to check")
     async def balance(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
-        # TODO: Implement balance check logic
-        # - Default to the interaction user if no user is provided
-        # - Fetch the coin balance for the target user from the database
-        # - If the user doesn't exist in the database, initialize them with 0 coins
-        # - Create and send an embed displaying the user's name, avatar, and current coin count
-        # - Use a gold/yellow color for the embed to match the casino theme
-        pass
+        target = user or interaction.user
+
+        async def work():
+            coins = await self.store.run("get_balance", target.id)
+            embed = create_embed(f"💰 {target.display_name}", f"**{coins:,}** coins", discord.Color.gold())
+            embed.set_thumbnail(url=target.display_avatar.url)
+            return {"embed": embed}
+
+        await self.responder.send(interaction, "balance", work)
 
     @app_commands.command(name="leaderboard", description="Show the top 10 richest users in the server.")
     async def leaderboard(self, interaction: discord.Interaction):
@@ -42,5 +71,36 @@ class Economy8Afc1FCog(commands.Cog):
         # - Handle cases where the database might be empty or have fewer than 10 users
         pass
 
+    @app_commands.command(name="casino_stats", description="Show house edge, return-to-player and wealth distribution.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def casino_stats(self, interaction: discord.Interaction):
+        async def work():
+            stats = await asyncio.to_thread(self.analytics.refresh)
+            embed = create_embed(
+                "📊 Casino Stats",
+                f"House edge: **{stats.house_edge:.2%}**\n"
+                f"Players: **{stats.players:,}** holding **{stats.coins:,}** coins\n"
+                f"Wealth Gini: **{stats.gini:.3f}**",
+                discord.Color.gold(),
+            )
+            for game, g in stats.games.items():
+                embed.add_field(
+                    name=game.replace("_", " ").title(),
+                    value=f"Bets: {g.bets:,}\nWagered: {g.wagered:,}\nRTP: {g.rtp:.2%}",
+                )
+            embed.add_field(
+                name="Jackpot",
+                value=f"Cuts in: {stats.jackpot_cuts:,}\nPaid out: {stats.jackpot_paid:,} "
+                f"({stats.jackpot_wins:,} wins)\nRTP: +{stats.jackpot_rtp:.2%}",
+            )
+            embed.add_field(
+                name="Daily bonus",
+                value=f"Claimed in last 24h: {stats.daily_uptake:.1%}\nTotal claims: {stats.daily_claims:,}",
+            )
+            embed.set_footer(text=f"Cached for {int(self.analytics.ttl)}s")
+            return {"embed": embed, "ephemeral": True}
+
+        await self.responder.send(interaction, "casino_stats", work, ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Economy8Afc1FCog(bot))
\ No newline at end of file
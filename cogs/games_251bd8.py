@@ -1,43 +1,199 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import random
+import time
+
 import discord
 from discord import app_commands
-from discord.ext import commands
-from typing import TYPE_CHECKING
+from discord.ext import commands, tasks
+from typing import TYPE_CHECKING, Dict, List, Literal, Set
+
+from utils.helpers import create_embed, format_error
+from utils.jackpot import Jackpot
+from utils.pagination import EmbedPaginator
+from utils.respond import get_responder
+from utils.storage import DuplicateInteraction, InsufficientFunds, get_store
+from utils.table import TableBet, TableRound
+from utils.wager import WagerOutcome, WagerPipeline
 
 if TYPE_CHECKING:
     from bot import LuckyDiceBot
 
+logger = logging.getLogger(__name__)
+
+SLOT_SYMBOLS: List[str] = ["🍒", "🍋", "🔔", "💎"]
+JACKPOT_SYMBOL = "💎"
+TABLE_COUNTDOWN = 30.0
+TABLE_PAGE_SIZE = 20
+
+def resolve_dice(bet: int) -> WagerOutcome:
+    roll = random.randint(1, 100)
+    won = roll > 50
+    return WagerOutcome(
+        bet * 2 if won else 0,
+        "🎲 Dice",
+        f"You rolled **{roll}** — {'you win' if won else 'you lose'} **{bet:,}** coins!",
+    )
+
+def resolve_slots(bet: int) -> WagerOutcome:
+    reels = [random.choice(SLOT_SYMBOLS) for _ in range(3)]
+    matches = max(reels.count(symbol) for symbol in reels)
+    return WagerOutcome(
+        bet * {3: 10, 2: 2}.get(matches, 0),
+        "🎰 Slots",
+        f"[ {' | '.join(reels)} ]",
+        jackpot=reels.count(JACKPOT_SYMBOL) == 3,
+    )
+
 class Games251Bd8Cog(commands.Cog):
     """Cog for casino games including dice and slots."""
 
     def __init__(self, bot: LuckyDiceBot) -> None:
         self.bot = bot
+        self.store = get_store(bot)
+        self.jackpot = Jackpot(self.store)
+        self.responder = get_responder(bot)
+        self.wagers = WagerPipeline(self.store, self.responder, self.jackpot)
+        self.tables: Dict[int, TableRound] = {}
+        self._table_tasks: Set[asyncio.Task] = set()
+
+    async def cog_load(self) -> None:
+        # Cuts that were settled but never flushed (e.g. a crash) are
+        # still in the ledger; rebuild the pot from it.
+        stored, recovered = await self.store.run(self.jackpot.recover)
+        if stored != recovered:
+            logger.warning("jackpot row held %s but the ledger says %s; using the ledger", stored, recovered)
+        self.flush_jackpot.start()
+
+    def cog_unload(self) -> None:
+        self.flush_jackpot.cancel()
+        self.jackpot.flush()
+        for task in self._table_tasks:
+            task.cancel()
+        # Give back stakes of rounds that will never be rolled
+        for table in self.tables.values():
+            table.close()
+            self.store.credit_batch("dice_table", [(b.user_id, b.stake, 0) for b in table.bets.values()], refund=True)
+        self.tables.clear()
+
+    @tasks.loop(minutes=1)
+    async def flush_jackpot(self) -> None:
+        # Errors are logged rather than raised: tasks.Loop would stop for
+        # good, and pending cuts stay in memory until the next attempt.
+        try:
+            await self.store.run(self.jackpot.flush)
+        except Exception:
+            logger.exception("jackpot flush failed; retrying next minute")
+
+    @app_commands.command(name="jackpot", description="Show the current progressive jackpot.")
+    async def jackpot_info(self, interaction: discord.Interaction) -> None:
+        async def work():
+            pot = await self.store.run(self.jackpot.amount)
+            embed = create_embed("💰 Progressive Jackpot", f"**{pot:,}** coins", discord.Color.gold())
+            embed.set_footer(text=f"Roll {JACKPOT_SYMBOL * 3} in /slots to win it all")
+            return {"embed": embed}
+
+        await self.responder.send(interaction, "jackpot", work)
 
     @app_commands.command(name="dice", description="Bet coins on a 1-100 dice roll. Win if the roll is over 50.")
     @app_commands.describe(bet="The amount of coins you want to wager")
     async def dice(self, interaction: discord.Interaction, bet: int) -> None:
-        # TODO: Implement the dice rolling game logic
-        # - Validate that the user has enough coins in their balance using the data_persistence method
-        # - Generate a random integer between 1 and 100
-        # - If the result is > 50, the user wins (2x payout); otherwise, they lose the bet
-        # - Update the user's balance in the database using the specified data_persistence method
-        # - Send an embed response showing the roll result, win/loss status, and updated balance
-        # - Use appropriate colors (e.g., Green for win, Red for loss)
-        pass
+        await self.wagers.play(interaction, "dice", bet, resolve_dice)
 
     @app_commands.command(name="slots", description="Play the slot machine for a chance to multiply your bet.")
     @app_commands.describe(bet="The amount of coins you want to wager")
     async def slots(self, interaction: discord.Interaction, bet: int) -> None:
-        # TODO: Implement the slot machine game logic
-        # - Check if the user has sufficient funds using the data_persistence method
-        # - Define a list of emojis (e.g., 🍒, 🍋, 🔔, 💎)
-        # - Randomly select 3 emojis to form the slot result
-        # - Calculate winnings based on matches (e.g., 3-of-a-kind = 10x, 2-of-a-kind = 2x, no match = 0x)
-        # - Update the user's balance in the database using the specified data_persistence method
-        # - Create a visually appealing embed displaying the slot reels (e.g., [ 🍒 | 💎 | 🍒 ])
-        # - Include the payout amount and new total balance in the response
-        pass
+        await self.wagers.play(interaction, "slots", bet, resolve_slots)
+
+    @app_commands.command(name="dice_table", description="Join this channel's shared dice table. One roll settles everyone.")
+    @app_commands.describe(bet="The amount of coins you want to wager", side="over wins on 51-100, under on 1-50")
+    async def dice_table(
+        self, interaction: discord.Interaction, bet: int, side: Literal["over", "under"] = "over"
+    ) -> None:
+        error = self.wagers.validate(bet)
+        if error:
+            await interaction.response.send_message(embed=format_error(error), ephemeral=True)
+            return
+        await self.responder.send(interaction, "dice_table", lambda: self._join_table(interaction, bet, side))
+
+    async def _join_table(self, interaction: discord.Interaction, bet: int, side: str):
+        user = interaction.user
+        table = self.tables.get(interaction.channel_id)
+        if table is None:
+            table = self.tables[interaction.channel_id] = TableRound(
+                interaction.channel_id, time.time() + TABLE_COUNTDOWN
+            )
+            task = asyncio.create_task(self._run_table(table, interaction.channel))
+            self._table_tasks.add(task)
+            task.add_done_callback(self._table_tasks.discard)
+        if user.id in table.bets:
+            return {"embed": format_error("You already have a bet on this table."), "ephemeral": True}
+        seat = TableBet(user.id, user.display_name, side, bet)
+        table.add(seat)  # hold the seat while the stake is reserved
+        try:
+            balance = await self.store.run("settle_wager", user.id, bet, 0, "dice_table", interaction.id)
+        except DuplicateInteraction:
+            table.bets.pop(user.id, None)
+            return {"embed": format_error("This command was already processed."), "ephemeral": True}
+        except InsufficientFunds as e:
+            table.bets.pop(user.id, None)
+            return {"embed": format_error(f"Not enough coins (you have **{e.balance:,}**)."), "ephemeral": True}
+        if table.closed:
+            # The roll happened while the stake was being reserved
+            try:
+                await self.store.run("credit_batch", "dice_table", [(user.id, bet, 0)], True)
+            except Exception:
+                logger.exception("dice table refund failed for user %s (%s coins)", user.id, bet)
+                return {
+                    "embed": format_error("The table just closed and your refund failed — please contact an admin."),
+                    "ephemeral": True,
+                }
+            return {"embed": format_error("The table just closed — your bet was refunded."), "ephemeral": True}
+        seat.confirmed = True
+        embed = create_embed(
+            "🎲 Dice Table",
+            f"{user.mention} bets **{bet:,}** on **{side}**.\n"
+            f"{len(table.bets):,} players · pot {table.pot:,} · rolls <t:{int(table.closes_at)}:R>",
+            discord.Color.blurple(),
+        )
+        embed.add_field(name="Balance", value=f"{balance:,} coins")
+        return {"embed": embed}
+
+    async def _run_table(self, table: TableRound, channel: discord.abc.Messageable) -> None:
+        await asyncio.sleep(max(0.0, table.closes_at - time.time()))
+        table.close()
+        self.tables.pop(table.channel_id, None)
+        if not table.bets:
+            return
+        # One roll, one wallet transaction and one message for the whole
+        # table; the cuts go into the pot inside that transaction.
+        credits = table.resolve(cut=self.jackpot.cut)
+        try:
+            await self.store.run("credit_batch", "dice_table", credits)
+        except Exception:
+            logger.exception("dice table settlement failed in channel %s", table.channel_id)
+            await self._refund_table(table, channel)
+            return
+        pages = table.render(TABLE_PAGE_SIZE)
+        if len(pages) > 1:
+            view = EmbedPaginator(pages)
+            view.message = await channel.send(embed=pages[0], view=view)
+        else:
+            await channel.send(embed=pages[0])
+
+    async def _refund_table(self, table: TableRound, channel: discord.abc.Messageable) -> None:
+        """Give back every stake of a round whose settlement failed and say so"""
+        refunds = [(bet.user_id, bet.stake, 0) for bet in table.bets.values()]
+        try:
+            await self.store.run("credit_batch", "dice_table", refunds, True)
+        except Exception:
+            logger.exception("dice table refund failed in channel %s: %r", table.channel_id, refunds)
+            message = "The round could not be settled and the refund failed — please contact an admin."
+        else:
+            message = "The round could not be settled — every bet was refunded."
+        await channel.send(embed=format_error(message))
 
 async def setup(bot: LuckyDiceBot) -> None:
     await bot.add_cog(Games251Bd8Cog(bot))
\ No newline at end of file
@@ -2,3 +2,4 @@
 import os
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
+DATABASE_PATH = os.getenv("DATABASE_PATH", "casino.db")
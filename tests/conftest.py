@@ -0,0 +1,16 @@
+import pytest
+
+from utils.dedupe import DISCORD_EPOCH_MS
+from utils.storage import WalletStore
+
+
+def snowflake(ts: float, seq: int = 0) -> int:
+    """A Discord snowflake id created at ``ts``"""
+    return (int(ts * 1000) - DISCORD_EPOCH_MS) << 22 | seq
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = WalletStore(str(tmp_path / "casino.db"))
+    yield store
+    store.close()
@@ -0,0 +1,49 @@
+from utils.analytics import CasinoAnalytics
+from utils.storage import WalletStore
+
+
+def test_jackpot_is_reported_on_its_own(tmp_path):
+    path = str(tmp_path / "casino.db")
+    store = WalletStore(path)
+    store.apply(1, 1_000, "grant")
+    store.settle_wager(1, 100, 0, "dice", cut=1)
+    store.add_jackpot(500)
+    store.settle_jackpot_win(1, 100, 1_000, "slots", None, 1, 0)
+    store.close()
+
+    stats = CasinoAnalytics(path).refresh(force=True)
+    dice, slots = stats.games["dice"], stats.games["slots"]
+    assert (slots.bets, slots.wagered, slots.net, slots.cut) == (1, 100, 1_000 - 1 - 100, 1)
+    assert (dice.net, dice.cut) == (-100, 1)
+    assert dice.house_edge == 0.99  # the cut went to the pot, not the house
+    assert (stats.jackpot_wins, stats.jackpot_paid, stats.jackpot_cuts) == (1, 500, 2)
+    assert stats.house_edge == -(-100 + 899 + 2) / 200
+
+
+def test_refresh_is_incremental_and_returns_a_copy(tmp_path):
+    path = str(tmp_path / "casino.db")
+    store = WalletStore(path)
+    store.apply(1, 1_000, "grant")
+    store.settle_wager(1, 100, 200, "dice")
+    analytics = CasinoAnalytics(path)
+    first = analytics.refresh(force=True)
+    first.games["dice"].bets = 99
+
+    store.settle_wager(1, 50, 0, "dice")
+    store.close()
+    dice = analytics.refresh(force=True).games["dice"]
+    assert (dice.bets, dice.wagered, dice.net) == (2, 150, 50)
+
+
+def test_refunded_table_seats_are_not_bets(tmp_path):
+    path = str(tmp_path / "casino.db")
+    store = WalletStore(path)
+    for user_id in (1, 2):
+        store.apply(user_id, 1_000, "grant")
+        store.settle_wager(user_id, 200, 0, "dice_table")
+    store.credit_batch("dice_table", [(1, 400, 0)])
+    store.credit_batch("dice_table", [(2, 200, 0)], refund=True)
+    store.close()
+
+    table = CasinoAnalytics(path).refresh(force=True).games["dice_table"]
+    assert (table.bets, table.wagered, table.net) == (1, 200, 200)
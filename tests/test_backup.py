@@ -0,0 +1,72 @@
+import io
+import time
+
+import pytest
+
+from tests.conftest import snowflake
+from utils.backup import MAGIC, BackupError, backup, restore
+from utils.storage import WalletStore
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.db")
+    store = WalletStore(path)
+    store.claim_daily(1, 500, 60)
+    for i in range(300):
+        store.apply(i % 7, i - 100, "dice" if i % 2 else "slots", None if i % 3 else snowflake(time.time(), i))
+    store.add_jackpot(42)
+    store.close()
+    return path
+
+
+def dump(conn_path: str):
+    store = WalletStore(conn_path)
+    try:
+        return {
+            table: store._conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+            for table in ("wallets", "transactions", "jackpot")
+        }
+    finally:
+        store.close()
+
+
+def make_backup(path: str, chunk_rows: int = 50) -> bytes:
+    out = io.BytesIO()
+    backup(out, path, chunk_rows)
+    return out.getvalue()
+
+
+def test_round_trip(source, tmp_path):
+    target = str(tmp_path / "target.db")
+    assert restore(io.BytesIO(make_backup(source)), target) == 300 + 1 + 7 + 1
+    assert dump(target) == dump(source)
+
+
+@pytest.mark.parametrize("data", [
+    MAGIC + b"Z",
+    MAGIC + b"T" + bytes([7]) + b"players" + b"\x00" + b"E" + bytes(8) + b"Z",
+])
+def test_incomplete_or_unknown_backup_is_rejected(source, data):
+    before = dump(source)
+    with pytest.raises(BackupError):
+        restore(io.BytesIO(data), source)
+    assert dump(source) == before
+
+
+def test_checksum_mismatch_rolls_back(source, tmp_path):
+    raw = bytearray(make_backup(source))
+    raw[-40] ^= 0xFF  # inside the last chunk's payload
+    target = str(tmp_path / "target.db")
+    restore(io.BytesIO(make_backup(source)), target)
+    before = dump(target)
+    with pytest.raises(BackupError):
+        restore(io.BytesIO(bytes(raw)), target)
+    assert dump(target) == before
+
+
+def test_corrupt_header_raises_backup_error(source, tmp_path):
+    raw = bytearray(make_backup(source))
+    raw[len(MAGIC) + 2] = 0xFF  # first byte of the first table name
+    with pytest.raises(BackupError):
+        restore(io.BytesIO(bytes(raw)), str(tmp_path / "target.db"))
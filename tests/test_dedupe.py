@@ -0,0 +1,45 @@
+from tests.conftest import snowflake
+from utils.dedupe import InteractionDeduper
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_replay_is_rejected():
+    clock = Clock()
+    dedupe = InteractionDeduper(clock=clock)
+    key = snowflake(clock.now)
+    assert dedupe.check_and_add(key)
+    assert not dedupe.check_and_add(key)
+
+
+def test_replay_caught_by_bloom_after_lru_eviction():
+    clock = Clock()
+    dedupe = InteractionDeduper(recent_size=10, clock=clock)
+    keys = [snowflake(clock.now, i) for i in range(100)]
+    for key in keys:
+        assert dedupe.check_and_add(key)
+    assert keys[0] not in dedupe._recent
+    assert not dedupe.check_and_add(keys[0])
+
+
+def test_stale_id_is_rejected():
+    clock = Clock()
+    dedupe = InteractionDeduper(clock=clock)
+    assert not dedupe.check_and_add(snowflake(clock.now - dedupe.horizon))
+
+
+def test_old_slices_expire():
+    clock = Clock()
+    dedupe = InteractionDeduper(recent_size=1, clock=clock)
+    key = snowflake(clock.now)
+    dedupe.add(key)
+    dedupe.add(snowflake(clock.now, 1))  # push ``key`` out of the LRU
+    clock.now += dedupe.horizon * 2
+    dedupe._rotate()
+    assert not any(key in bloom for bloom in dedupe._slices)
@@ -0,0 +1,100 @@
+import pytest
+
+from utils.jackpot import Jackpot, ShardedCounter
+from utils.storage import InsufficientFunds, WalletStore
+from utils.table import TableBet, TableRound
+
+
+def settle(store: WalletStore, jackpot: Jackpot, user_id: int, stake: int, payout: int) -> None:
+    jackpot.settle(user_id, stake, payout, "dice")
+
+
+def test_cut_is_taken_from_the_win(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 1_000, "seed")
+    settle(store, jackpot, 1, 100, 200)
+    assert store.get_balance(1) == 1_099
+    assert jackpot.amount() == 1
+    # Wallets plus pot grew by exactly the game's payout minus the stake
+    assert store.get_balance(1) + jackpot.amount() == 1_000 + 200 - 100
+
+
+def test_cut_on_a_loss_comes_out_of_the_lost_stake(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 1_000, "seed")
+    settle(store, jackpot, 1, 100, 0)
+    assert store.get_balance(1) == 900
+    assert jackpot.amount() == 1
+
+
+def test_small_bets_do_not_feed_the_pot(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 100, "seed")
+    for _ in range(100):
+        settle(store, jackpot, 1, 1, 0)
+    assert jackpot.amount() == 0
+
+
+def test_cut_is_recorded_in_the_ledger(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 1_000, "seed")
+    settle(store, jackpot, 1, 500, 1_000)
+    assert store._conn.execute("SELECT SUM(cut) FROM transactions").fetchone()[0] == 5
+
+
+def test_table_round_conserves_coins():
+    table = TableRound(channel_id=1, closes_at=0.0)
+    table.add(TableBet(1, "a", "over", 200))
+    table.add(TableBet(2, "b", "under", 300))
+    credits = table.resolve(roll=80, cut=lambda stake: stake // 100)
+    assert sorted(credits) == [(1, 398, 2), (2, 0, 3)]
+
+
+def test_sharded_counter_drain_resets():
+    counter = ShardedCounter(4)
+    for key in range(10):
+        counter.add(1, key=key)
+    assert counter.value() == 10
+    assert counter.drain() == 10
+    assert counter.value() == 0
+
+
+def test_jackpot_win_pays_pot_in_the_same_settlement(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 1_000, "seed")
+    store.add_jackpot(500)
+    jackpot.contribute(7, 20)
+    balance, won, cut = jackpot.settle_win(1, 100, 1_000, "slots")
+    assert (won, cut) == (520, 1)
+    assert balance == 1_000 - 100 + 1_000 - 1 + 520
+    assert jackpot.amount() == 1  # only this bet's cut is left
+
+
+def test_failed_jackpot_win_keeps_the_pot(store):
+    jackpot = Jackpot(store)
+    store.add_jackpot(500)
+    jackpot.contribute(7, 20)
+    with pytest.raises(InsufficientFunds):
+        jackpot.settle_win(1, 100, 1_000, "slots")
+    assert jackpot.amount() == 520
+    assert store.get_balance(1) == 0
+
+
+def test_table_cuts_feed_the_pot_in_the_batch(store):
+    jackpot = Jackpot(store)
+    store.credit_batch("dice_table", [(1, 398, 2), (2, 0, 3)])
+    assert store.get_jackpot() == 5
+    assert jackpot.amount() == 5
+
+
+def test_recover_rebuilds_lost_contributions(store):
+    jackpot = Jackpot(store)
+    store.apply(1, 10_000, "seed")
+    settle(store, jackpot, 1, 1_000, 0)
+    jackpot.settle_win(1, 100, 1_000, "slots")
+    settle(store, jackpot, 1, 500, 0)
+    assert jackpot.amount() == 1 + 5  # the win took the first cut
+    # A restart loses whatever was still pending in memory
+    restarted = Jackpot(store)
+    assert restarted.recover() == (0, 1 + 5)
+    assert restarted.amount() == 1 + 5
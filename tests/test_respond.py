@@ -0,0 +1,86 @@
+import asyncio
+
+import discord
+import pytest
+
+from utils.respond import AdaptiveResponder
+
+
+class FakeInteraction:
+    """Records the calls the responder makes"""
+
+    def __init__(self) -> None:
+        self.created_at = discord.utils.utcnow()
+        self.calls = []
+        self.response = self
+        self.followup = self
+
+    async def defer(self, ephemeral: bool, thinking: bool) -> None:
+        self.calls.append(("defer", ephemeral))
+
+    async def send_message(self, **reply) -> None:
+        self.calls.append(("send_message", reply.get("ephemeral", False)))
+
+    async def send(self, **reply) -> None:
+        self.calls.append(("followup", reply.get("ephemeral", False)))
+
+    async def delete_original_response(self) -> None:
+        self.calls.append(("delete", None))
+
+
+def run(reply, ephemeral=False, delay=0.2, deadline=0.05):
+    responder = AdaptiveResponder("sqlite", deadline=deadline, margin=0.0)
+    interaction = FakeInteraction()
+
+    async def work():
+        await asyncio.sleep(delay)
+        return reply
+
+    asyncio.run(responder.send(interaction, "test", work, ephemeral=ephemeral))
+    return interaction.calls
+
+
+def test_fast_reply_is_sent_directly():
+    assert run({"content": "hi"}, delay=0.0, deadline=1.0) == [("send_message", False)]
+
+
+def test_public_reply_after_defer_uses_followup():
+    assert run({"content": "hi"}) == [("defer", False), ("followup", False)]
+
+
+def test_ephemeral_reply_after_public_defer_replaces_placeholder():
+    assert run({"content": "no", "ephemeral": True}) == [("defer", False), ("delete", None), ("followup", True)]
+
+
+def test_ephemeral_defer_keeps_placeholder():
+    assert run({"content": "no", "ephemeral": True}, ephemeral=True) == [("defer", True), ("followup", True)]
+
+
+def test_no_reply_after_defer_removes_placeholder():
+    assert run(None) == [("defer", False), ("delete", None)]
+
+
+def failing_run(delay, deadline=0.05):
+    responder = AdaptiveResponder("sqlite", deadline=deadline, margin=0.0)
+    interaction = FakeInteraction()
+
+    async def work():
+        await asyncio.sleep(delay)
+        raise RuntimeError("database is locked")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(responder.send(interaction, "test", work))
+    assert responder.latency.predict(("test", "sqlite")) > 0
+    return interaction.calls, responder.summary()["test"]
+
+
+def test_failure_after_defer_replaces_placeholder_with_error():
+    calls, counts = failing_run(delay=0.2)
+    assert calls == [("defer", False), ("delete", None), ("followup", True)]
+    assert counts == {"late_defer": 1, "failed": 1}
+
+
+def test_failure_on_fast_path_is_answered():
+    calls, counts = failing_run(delay=0.0, deadline=1.0)
+    assert calls == [("send_message", True)]
+    assert counts == {"failed": 1}
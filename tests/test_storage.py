@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from tests.conftest import snowflake
+from utils.storage import DuplicateInteraction, InsufficientFunds, WalletStore
+
+
+def ledger_rows(store: WalletStore) -> int:
+    return store._conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+
+def test_replayed_interaction_is_applied_once(store):
+    key = snowflake(time.time())
+    assert store.apply(1, 100, "seed", key) == 100
+    with pytest.raises(DuplicateInteraction):
+        store.apply(1, 100, "seed", key)
+    assert store.get_balance(1) == 100
+    assert ledger_rows(store) == 1
+
+
+def test_settle_wager_refuses_to_overdraw(store):
+    store.apply(1, 50, "seed")
+    with pytest.raises(InsufficientFunds) as err:
+        store.settle_wager(1, 60, 120, "dice", snowflake(time.time()))
+    assert err.value.balance == 50
+    assert store.get_balance(1) == 50
+    assert ledger_rows(store) == 1
+
+
+def test_settle_wager_unknown_user_has_no_funds(store):
+    with pytest.raises(InsufficientFunds):
+        store.settle_wager(42, 1, 0, "dice")
+    assert store.get_balance(42) == 0
+
+
+def test_rejected_wager_can_be_retried(store):
+    key = snowflake(time.time())
+    store.apply(1, 10, "seed")
+    with pytest.raises(InsufficientFunds):
+        store.settle_wager(1, 20, 0, "dice", key)
+    store.apply(1, 10, "seed")
+    assert store.settle_wager(1, 20, 0, "dice", key) == 0
+
+
+def test_replay_after_restart_is_rejected(tmp_path):
+    path = str(tmp_path / "casino.db")
+    key = snowflake(time.time())
+    store = WalletStore(path)
+    store.apply(1, 100, "seed", key)
+    store.close()
+
+    restarted = WalletStore(path)
+    with pytest.raises(DuplicateInteraction):
+        restarted.apply(1, 100, "seed", key)
+    assert restarted.get_balance(1) == 100
+    restarted.close()
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import discord
+
+from cogs.games_251bd8 import Games251Bd8Cog
+from utils.jackpot import Jackpot
+from utils.pagination import EmbedPaginator
+from utils.storage import WalletStore
+from utils.table import TableBet, TableRound
+
+
+class FailingStore(WalletStore):
+    """Store whose first batch credit fails"""
+
+    failures = 1
+
+    def credit_batch(self, kind, credits, refund=False):
+        if not refund and self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        super().credit_batch(kind, credits, refund)
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send(self, **kwargs) -> None:
+        self.sent.append(kwargs)
+
+
+def test_failed_settlement_refunds_every_stake(tmp_path):
+    store = FailingStore(str(tmp_path / "casino.db"))
+    cog = Games251Bd8Cog.__new__(Games251Bd8Cog)
+    cog.store, cog.jackpot, cog.tables = store, Jackpot(store), {}
+    table = TableRound(channel_id=1, closes_at=time.time())
+    for user_id, side in ((1, "over"), (2, "under")):
+        store.apply(user_id, 1_000, "grant")
+        store.settle_wager(user_id, 200, 0, "dice_table")
+        seat = TableBet(user_id, f"player{user_id}", side, 200)
+        seat.confirmed = True
+        table.add(seat)
+
+    channel = FakeChannel()
+    asyncio.run(cog._run_table(table, channel))
+
+    assert [store.get_balance(uid) for uid in (1, 2)] == [1_000, 1_000]
+    assert cog.jackpot.amount() == 0
+    assert len(channel.sent) == 1 and "refunded" in channel.sent[0]["embed"].description
+    store.close()
+
+
+def test_paginator_disables_buttons_on_timeout():
+    edits = []
+
+    class FakeMessage:
+        async def edit(self, view) -> None:
+            edits.append([item.disabled for item in view.children])
+
+    async def scenario():
+        view = EmbedPaginator([discord.Embed(title="1"), discord.Embed(title="2")])
+        view.message = FakeMessage()
+        await view.on_timeout()
+
+    asyncio.run(scenario())
+    assert edits == [[True, True]]
@@ -0,0 +1,182 @@
+"""Casino analytics: SQL ledger aggregates plus numpy wallet statistics
+
+Per-game totals are folded in incrementally with one ``GROUP BY kind``
+over the ledger rows added since the last refresh; wallet-level stats are
+recomputed from the wallet columns with numpy.  All of it is synchronous
+and meant to run in a worker thread.
+
+使い方: python -m utils.analytics [casino.db]
+"""
+from __future__ import annotations
+
+import copy
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+
+GAMES = ("dice", "slots", "dice_table")
+DAY = 24 * 60 * 60
+
+
+def gini(values: np.ndarray) -> float:
+    """Gini coefficient of non-negative values (0 = equal, 1 = one holder)"""
+    if values.size == 0 or not values.any():
+        return 0.0
+    v = np.sort(values.astype(np.float64))
+    ranks = np.arange(1, v.size + 1)
+    return float((2 * ranks - v.size - 1) @ v / (v.size * v.sum()))
+
+
+class GameStats:
+    """Running totals for one game"""
+
+    def __init__(self) -> None:
+        self.bets = 0
+        self.wagered = 0
+        self.net = 0  # player net result, after the jackpot cut
+        self.cut = 0  # this game's contribution to the jackpot
+
+    @property
+    def rtp(self) -> float:
+        """Realized return to player from the game itself (payouts / stakes)"""
+        return (self.wagered + self.net) / self.wagered if self.wagered else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        """What the house keeps; the cut goes to the jackpot, not the house"""
+        return -(self.net + self.cut) / self.wagered if self.wagered else 0.0
+
+
+class CasinoStats:
+    """Snapshot of the operator-facing metrics"""
+
+    def __init__(self) -> None:
+        self.games: Dict[str, GameStats] = {game: GameStats() for game in GAMES}
+        self.players = 0
+        self.coins = 0
+        self.gini = 0.0
+        self.daily_uptake = 0.0  # share of wallets that claimed within 24h
+        self.daily_claims = 0
+        self.jackpot_wins = 0
+        self.jackpot_paid = 0
+        self.computed_at = 0.0
+
+    @property
+    def wagered(self) -> int:
+        return sum(g.wagered for g in self.games.values())
+
+    @property
+    def jackpot_cuts(self) -> int:
+        return sum(g.cut for g in self.games.values())
+
+    @property
+    def jackpot_rtp(self) -> float:
+        """Jackpot payouts as a share of all stakes, on top of the game RTPs"""
+        return self.jackpot_paid / self.wagered if self.wagered else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        wagered = self.wagered
+        return -sum(g.net + g.cut for g in self.games.values()) / wagered if wagered else 0.0
+
+
+class CasinoAnalytics:
+    """Caches :class:`CasinoStats` and refreshes it incrementally"""
+
+    def __init__(self, db_path: str = config.DATABASE_PATH, ttl: float = 60.0) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = CasinoStats()
+        self._last_id = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+
+    def _fold_ledger(self, conn: sqlite3.Connection) -> None:
+        (last_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+        if last_id <= self._last_id:
+            return
+        # A bet is a row that places a stake and a refund (negative stake)
+        # takes it back; payouts and daily claims carry none.  Jackpot
+        # payouts are funded by every game's cut, so they are reported on
+        # their own rather than credited to the game that hit them.
+        # Bounding by ``last_id`` keeps rows committed during the scan for
+        # the next refresh.
+        rows = conn.execute(
+            "SELECT kind, COUNT(*), SUM(CASE WHEN stake > 0 THEN 1 WHEN stake < 0 THEN -1 ELSE 0 END), "
+            "SUM(stake), SUM(delta), SUM(cut) FROM transactions "
+            "WHERE id > ? AND id <= ? GROUP BY kind",
+            (self._last_id, last_id),
+        ).fetchall()
+        stats = self._stats
+        for kind, count, bets, wagered, net, cut in rows:
+            if kind == "daily":
+                stats.daily_claims += count
+                continue
+            if kind == "jackpot":
+                stats.jackpot_wins += count
+                stats.jackpot_paid += net
+                continue
+            totals = stats.games.get(kind)
+            if totals is None:
+                continue
+            totals.bets += bets
+            totals.wagered += wagered
+            totals.net += net
+            totals.cut += cut
+        self._last_id = last_id
+
+    def _scan_wallets(self, conn: sqlite3.Connection, now: float) -> None:
+        rows = conn.execute("SELECT balance, COALESCE(last_daily, 0) FROM wallets").fetchall()
+        data = np.array(rows, dtype=np.float64).reshape(-1, 2)
+        balances, last_daily = data[:, 0], data[:, 1]
+        stats = self._stats
+        stats.players = int(balances.size)
+        stats.coins = int(balances.sum())
+        stats.gini = gini(np.clip(balances, 0, None))
+        stats.daily_uptake = float(np.mean(last_daily >= now - DAY)) if balances.size else 0.0
+
+    def refresh(self, force: bool = False) -> CasinoStats:
+        """Return cached stats, recomputing them if older than ``ttl``"""
+        with self._lock:
+            now = time.time()
+            if force or now - self._stats.computed_at >= self.ttl:
+                conn = self._connect()
+                try:
+                    self._fold_ledger(conn)
+                    self._scan_wallets(conn, now)
+                finally:
+                    conn.close()
+                self._stats.computed_at = now
+            return copy.deepcopy(self._stats)
+
+
+def format_report(stats: CasinoStats) -> str:
+    lines = [f"players {stats.players:,}  coins {stats.coins:,}  gini {stats.gini:.3f}"]
+    for game, g in stats.games.items():
+        lines.append(f"{game:10} bets {g.bets:,}  wagered {g.wagered:,}  RTP {g.rtp:.2%}  edge {g.house_edge:.2%}")
+    lines.append(f"jackpot    cuts {stats.jackpot_cuts:,}  paid {stats.jackpot_paid:,} in {stats.jackpot_wins:,} wins  "
+                 f"RTP +{stats.jackpot_rtp:.2%}")
+    lines.append(f"house edge {stats.house_edge:.2%}  daily uptake {stats.daily_uptake:.1%}  "
+                 f"daily claims {stats.daily_claims:,}")
+    return "\n".join(lines)
+
+
+def main(argv: List[str]) -> int:
+    db_path: Optional[str] = argv[0] if argv else config.DATABASE_PATH
+    start = time.perf_counter()
+    stats = CasinoAnalytics(db_path).refresh(force=True)
+    print(format_report(stats))
+    print(f"({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,116 @@
+"""Bounded exactly-once filter for Discord interaction ids"""
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, List
+
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def snowflake_time(snowflake: int) -> float:
+    """Unix timestamp (seconds) encoded in a Discord snowflake"""
+    return ((snowflake >> 22) + DISCORD_EPOCH_MS) / 1000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integer keys (double hashing)"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: int):
+        digest = hashlib.blake2b(key.to_bytes(16, "little", signed=True), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: int) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class InteractionDeduper:
+    """Remembers recently applied interaction ids in constant memory.
+
+    The newest ids live in an exact LRU; older ones (up to ``horizon``
+    seconds) in a ring of time-sliced Bloom filters, so a lookup that misses
+    the LRU may report a false positive with roughly
+    ``slices * error_rate`` probability.  Only ``horizon - slice_span``
+    seconds are guaranteed to be covered, so ids whose snowflake timestamp is
+    older than that are rejected outright: Discord interaction tokens expire
+    after 15 minutes, so they can only be replays.
+
+    Slices are never retired early, so a repeat inside the horizon is always
+    caught; if more than ``slice_capacity`` ids arrive within one slice the
+    false-positive rate rises above ``error_rate`` instead.
+    """
+
+    def __init__(
+        self,
+        horizon: float = 20 * 60,
+        slices: int = 4,
+        slice_capacity: int = 50_000,
+        error_rate: float = 1e-5,
+        recent_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.horizon = horizon
+        self.slice_span = horizon / slices
+        self.slice_capacity = slice_capacity
+        self.error_rate = error_rate
+        self.recent_size = recent_size
+        self._clock = clock
+        self._recent: OrderedDict[int, None] = OrderedDict()
+        self._slices: List[BloomFilter] = [self._new_slice() for _ in range(slices)]
+        self._slice_started = clock()
+
+    def _new_slice(self) -> BloomFilter:
+        return BloomFilter(self.slice_capacity, self.error_rate)
+
+    def _rotate(self) -> None:
+        steps = int((self._clock() - self._slice_started) // self.slice_span)
+        if steps <= 0:
+            return
+        for _ in range(min(steps, len(self._slices))):
+            self._slices.pop()
+            self._slices.insert(0, self._new_slice())
+        self._slice_started += steps * self.slice_span
+
+    def is_stale(self, key: int) -> bool:
+        """True if ``key`` is older than the window the slices still cover"""
+        return snowflake_time(key) < self._clock() - (self.horizon - self.slice_span)
+
+    def __contains__(self, key: int) -> bool:
+        if key in self._recent:
+            return True
+        if self.is_stale(key):
+            return True
+        self._rotate()
+        return any(key in bloom for bloom in self._slices)
+
+    def add(self, key: int) -> None:
+        self._rotate()
+        self._slices[0].add(key)
+        self._recent[key] = None
+        if len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+
+    def check_and_add(self, key: int) -> bool:
+        """Return True the first time ``key`` is seen, False for a repeat"""
+        if key in self:
+            return False
+        self.add(key)
+        return True
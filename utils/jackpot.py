@@ -0,0 +1,138 @@
+"""Progressive jackpot backed by a sharded in-memory counter"""
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import List, Optional, Tuple
+
+from utils.storage import WalletStore
+
+JACKPOT_BPS = 100  # 1% of every stake, taken out of the winnings or lost stake
+
+
+class ShardedCounter:
+    """Integer counter split across independently locked shards.
+
+    Increments touch one shard, so concurrent writers rarely contend;
+    reads sum the shards and :meth:`drain` takes every shard lock (in a
+    fixed order) to move the whole total out atomically.
+    """
+
+    def __init__(self, shards: int = 16) -> None:
+        self._values: List[int] = [0] * shards
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._next = itertools.count()
+        self._local = threading.local()
+
+    def _shard(self, key: Optional[int]) -> int:
+        if key is not None:
+            return key % len(self._values)
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = next(self._next) % len(self._values)
+        return shard
+
+    def add(self, amount: int, key: Optional[int] = None) -> None:
+        shard = self._shard(key)
+        with self._locks[shard]:
+            self._values[shard] += amount
+
+    def value(self) -> int:
+        return sum(self._values)
+
+    def drain(self) -> int:
+        """Atomically reset every shard and return the combined total"""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            total = sum(self._values)
+            self._values = [0] * len(self._values)
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+        return total
+
+
+class Jackpot:
+    """Progressive jackpot fed by a cut of every wager.
+
+    The cut is taken inside the wager's own settlement (see
+    :meth:`WalletStore.settle_wager`), so feeding the pot never mints coins.
+
+    Contributions accumulate in a :class:`ShardedCounter` and are merged
+    into the ``jackpot`` row by :meth:`flush` (periodically) or when the
+    pot is claimed, so the hot path never writes the shared row.  Since
+    every cut is in the ledger, :meth:`recover` can rebuild the pot if
+    pending contributions were lost.
+    """
+
+    def __init__(self, store: WalletStore, bps: int = JACKPOT_BPS, shards: int = 16) -> None:
+        self.store = store
+        self.bps = bps
+        self.pending = ShardedCounter(shards)
+
+    def cut(self, stake: int) -> int:
+        """The pot's share of ``stake`` (rounded down; small bets give nothing)"""
+        return stake * self.bps // 10_000
+
+    def contribute(self, key: int, amount: int) -> None:
+        """Add a cut that has already been settled in the ledger"""
+        if amount:
+            self.pending.add(amount, key=key)
+
+    def settle(
+        self, user_id: int, stake: int, payout: int, kind: str, interaction_id: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Settle an ordinary wager and feed its cut to the pot.
+
+        Runs in one worker call so a cancelled caller cannot separate the
+        committed cut from its contribution.  Returns ``(balance, cut)``.
+        """
+        cut = self.cut(stake)
+        balance = self.store.settle_wager(user_id, stake, payout, kind, interaction_id, cut)
+        self.contribute(user_id, cut)
+        return balance, cut
+
+    def recover(self) -> Tuple[int, int]:
+        """Rebuild the stored pot from the ledger; meant for startup.
+
+        Pending contributions are folded in (they are already in the
+        ledger).  Returns ``(stored, recovered)``.
+        """
+        drained = self.pending.drain()
+        try:
+            return self.store.reconcile_jackpot()
+        except Exception:
+            self.pending.add(drained)
+            raise
+
+    def amount(self) -> int:
+        return self.store.get_jackpot() + self.pending.value()
+
+    def flush(self) -> int:
+        """Merge pending contributions into storage; returns the stored pot"""
+        drained = self.pending.drain()
+        try:
+            return self.store.add_jackpot(drained)
+        except Exception:
+            self.pending.add(drained)
+            raise
+
+    def settle_win(
+        self, user_id: int, stake: int, payout: int, kind: str, interaction_id: Optional[int] = None
+    ) -> Tuple[int, int, int]:
+        """Settle a jackpot-winning wager together with the pot payout.
+
+        Pending shards are drained first and go back into the counter if
+        the transaction fails (including :class:`InsufficientFunds`).
+        Returns ``(balance, won, cut)``.
+        """
+        cut = self.cut(stake)
+        drained = self.pending.drain()
+        try:
+            balance, won = self.store.settle_jackpot_win(user_id, stake, payout, kind, interaction_id, cut, drained)
+        except BaseException:
+            self.pending.add(drained)
+            raise
+        self.contribute(user_id, cut)
+        return balance, won, cut
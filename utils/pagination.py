@@ -0,0 +1,50 @@
+"""Button-driven pagination for multi-page embeds"""
+from __future__ import annotations
+
+from typing import List, Optional
+
+import discord
+
+
+class EmbedPaginator(discord.ui.View):
+    """Flip through a fixed list of embeds with ◀ / ▶ buttons.
+
+    Paging is shared: anyone who can see the message turns the page for
+    everyone, which suits public results such as a table round.  Set
+    :attr:`message` to the sent message so the buttons can be disabled
+    when the view times out.
+    """
+
+    def __init__(self, pages: List[discord.Embed], timeout: float = 300.0) -> None:
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.index = 0
+        self.message: Optional[discord.Message] = None
+        for i, page in enumerate(pages):
+            page.set_footer(text=f"Page {i + 1}/{len(pages)}")
+        self._sync_buttons()
+
+    def _sync_buttons(self) -> None:
+        self.previous.disabled = self.index == 0
+        self.next.disabled = self.index >= len(self.pages) - 1
+
+    async def _show(self, interaction: discord.Interaction, index: int) -> None:
+        self.index = index
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.pages[index], view=self)
+
+    async def on_timeout(self) -> None:
+        self.previous.disabled = self.next.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass  # the message was deleted or is no longer editable
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, self.index - 1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, self.index + 1)
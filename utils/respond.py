@@ -0,0 +1,170 @@
+"""Adaptive interaction responses: defer only when the deadline is at risk"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import discord
+
+from utils.helpers import format_error
+from utils.storage import get_store
+
+INTERACTION_DEADLINE = 3.0
+SAFETY_MARGIN = 0.6  # time left for the response call itself
+
+Reply = Dict[str, Any]  # keyword arguments for send_message / followup.send
+FAILURE_MESSAGE = "Something went wrong — please try again later."
+
+
+class LatencyTracker:
+    """Smoothed latency per (command, backend), in the style of TCP's RTO"""
+
+    def __init__(self, alpha: float = 0.125, beta: float = 0.25) -> None:
+        self.alpha = alpha
+        self.beta = beta
+        self._mean: Dict[Tuple[str, str], float] = {}
+        self._dev: Dict[Tuple[str, str], float] = {}
+
+    def record(self, key: Tuple[str, str], seconds: float) -> None:
+        if key not in self._mean:
+            self._mean[key] = seconds
+            self._dev[key] = seconds / 2
+            return
+        mean = self._mean[key]
+        self._dev[key] += self.beta * (abs(seconds - mean) - self._dev[key])
+        self._mean[key] = mean + self.alpha * (seconds - mean)
+
+    def predict(self, key: Tuple[str, str]) -> float:
+        """Pessimistic estimate (mean + 4 deviations); 0 until the first sample"""
+        return self._mean.get(key, 0.0) + 4 * self._dev.get(key, 0.0)
+
+
+class AdaptiveResponder:
+    """Answers an interaction in one call when it can, deferring otherwise.
+
+    The command's work is started immediately.  If the predicted latency
+    already overshoots what is left of Discord's 3-second window, the
+    interaction is deferred up front; otherwise the reply is awaited until
+    the budget runs out and only then deferred.  The fast path therefore
+    costs a single ``send_message`` instead of ``defer`` + ``followup``.
+    """
+
+    def __init__(self, backend: str, deadline: float = INTERACTION_DEADLINE, margin: float = SAFETY_MARGIN) -> None:
+        self.backend = backend
+        self.deadline = deadline
+        self.margin = margin
+        self.latency = LatencyTracker()
+        # command -> Counter(direct / deferred / late_defer / missed / failed)
+        self.paths: Dict[str, Counter] = {}
+
+    def _budget(self, interaction: discord.Interaction) -> float:
+        age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        return self.deadline - self.margin - max(0.0, age)
+
+    async def _defer(self, interaction: discord.Interaction, counts: Counter, path: str, ephemeral: bool) -> bool:
+        try:
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+        except discord.NotFound:
+            counts["missed"] += 1
+            return False
+        counts[path] += 1
+        return True
+
+    async def _drop_placeholder(self, interaction: discord.Interaction) -> None:
+        """Remove the "thinking…" message left by a defer"""
+        try:
+            await interaction.delete_original_response()
+        except discord.HTTPException:
+            pass
+
+    async def send(
+        self,
+        interaction: discord.Interaction,
+        command: str,
+        work: Callable[[], Awaitable[Optional[Reply]]],
+        ephemeral: bool = False,
+    ) -> None:
+        """Run ``work`` and deliver the reply it returns (``None`` sends nothing).
+
+        ``ephemeral`` decides the visibility of a deferred response, which
+        the follow-up cannot change.  When a public defer is answered with
+        an ephemeral reply (e.g. an error), the placeholder is deleted and
+        the reply is sent as a separate ephemeral follow-up; a ``None``
+        reply after a defer deletes the placeholder.  If ``work`` raises,
+        it is counted as ``failed``, the user gets a generic ephemeral error
+        and the exception is re-raised.
+        """
+        key = (command, self.backend)
+        counts = self.paths.setdefault(command, Counter())
+        budget = self._budget(interaction)
+        start = time.perf_counter()
+        task = asyncio.ensure_future(work())
+
+        deferred = alive = False
+        if self.latency.predict(key) >= budget:
+            deferred = alive = await self._defer(interaction, counts, "deferred", ephemeral)
+        else:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=max(0.0, budget))
+                alive = True
+            except asyncio.TimeoutError:
+                deferred = alive = await self._defer(interaction, counts, "late_defer", ephemeral)
+            except Exception:
+                alive = True  # raised within the budget; re-raised below
+
+        # Always let the work finish: a settled bet must not be cut short
+        # just because the reply can no longer be delivered.
+        try:
+            reply = await task
+        except Exception:
+            counts["failed"] += 1
+            if alive:
+                error = {"embed": format_error(FAILURE_MESSAGE), "ephemeral": True}
+                try:
+                    await self._deliver(interaction, counts, error, deferred, ephemeral, count=False)
+                except discord.HTTPException:
+                    pass  # keep the original exception
+            raise
+        finally:
+            self.latency.record(key, time.perf_counter() - start)
+        if alive:
+            await self._deliver(interaction, counts, reply, deferred, ephemeral)
+
+    async def _deliver(
+        self,
+        interaction: discord.Interaction,
+        counts: Counter,
+        reply: Optional[Reply],
+        deferred: bool,
+        ephemeral: bool,
+        count: bool = True,
+    ) -> None:
+        """Send ``reply`` on whichever path the interaction is on"""
+        if deferred and (reply is None or (reply.get("ephemeral") and not ephemeral)):
+            await self._drop_placeholder(interaction)
+        if reply is None:
+            return
+        try:
+            if deferred:
+                await interaction.followup.send(**reply)
+            else:
+                await interaction.response.send_message(**reply)
+                if count:
+                    counts["direct"] += 1
+        except discord.NotFound:
+            if count:
+                counts["missed"] += 1
+
+    def summary(self) -> Dict[str, Counter]:
+        return {command: Counter(counts) for command, counts in self.paths.items()}
+
+
+def get_responder(bot: Any) -> AdaptiveResponder:
+    """Return the bot-wide :class:`AdaptiveResponder`, creating it on first use"""
+    responder = getattr(bot, "responder", None)
+    if responder is None:
+        responder = AdaptiveResponder(backend=get_store(bot).backend)
+        bot.responder = responder
+    return responder
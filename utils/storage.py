@@ -0,0 +1,327 @@
+"""SQLite wallet and transaction ledger"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+import config
+from utils.dedupe import InteractionDeduper
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallets (
+    user_id     INTEGER PRIMARY KEY,
+    balance     INTEGER NOT NULL DEFAULT 0,
+    last_daily  REAL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id         INTEGER NOT NULL,
+    delta           INTEGER NOT NULL,
+    stake           INTEGER NOT NULL DEFAULT 0,
+    cut             INTEGER NOT NULL DEFAULT 0,
+    kind            TEXT NOT NULL,
+    interaction_id  INTEGER,
+    created_at      REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jackpot (
+    id      INTEGER PRIMARY KEY CHECK (id = 1),
+    amount  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO jackpot (id, amount) VALUES (1, 0);
+"""
+
+
+def init_schema(conn: sqlite3.Connection) -> None:
+    """Create the tables and add columns introduced after the first release"""
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+    for column in ("stake", "cut"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE transactions ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+
+class DuplicateInteraction(Exception):
+    """The interaction has already been settled"""
+
+
+class InsufficientFunds(Exception):
+    """The wallet cannot cover the stake"""
+
+    def __init__(self, balance: int):
+        super().__init__(balance)
+        self.balance = balance
+
+
+class WalletStore:
+    """Wallet balances plus an append-only transaction ledger.
+
+    Every mutation carries the id of the Discord interaction that caused it
+    and is passed through an :class:`InteractionDeduper`, so a retried or
+    double-clicked command is settled at most once.  The deduper is seeded
+    from the ledger on startup, so this also holds across a restart.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = config.DATABASE_PATH, deduper: Optional[InteractionDeduper] = None) -> None:
+        self.path = path
+        self.dedupe = deduper or InteractionDeduper()
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        init_schema(self._conn)
+        self._seed_dedupe()
+
+    def _seed_dedupe(self) -> None:
+        """Re-learn the interaction ids settled within the dedupe horizon"""
+        cutoff = time.time() - self.dedupe.horizon
+        recent = []
+        # Newest first, stopping at the horizon, so only the tail of the
+        # ledger is read
+        for interaction_id, created_at in self._conn.execute(
+            "SELECT interaction_id, created_at FROM transactions ORDER BY id DESC"
+        ):
+            if created_at < cutoff:
+                break
+            if interaction_id is not None:
+                recent.append(interaction_id)
+        for interaction_id in reversed(recent):
+            self.dedupe.add(interaction_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ──────────────────────────────────────────────
+    # 同期 API (ワーカースレッドで実行)
+    # ──────────────────────────────────────────────
+
+    def _claim(self, interaction_id: Optional[int]) -> None:
+        if interaction_id is not None and interaction_id in self.dedupe:
+            raise DuplicateInteraction(interaction_id)
+
+    def _record(
+        self,
+        user_id: int,
+        delta: int,
+        kind: str,
+        interaction_id: Optional[int],
+        now: float,
+        stake: int = 0,
+        cut: int = 0,
+    ) -> None:
+        self._conn.execute(
+            "INSERT INTO transactions (user_id, delta, stake, cut, kind, interaction_id, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user_id, delta, stake, cut, kind, interaction_id, now),
+        )
+
+    def get_balance(self, user_id: int) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT balance FROM wallets WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else 0
+
+    def apply(self, user_id: int, delta: int, kind: str, interaction_id: Optional[int] = None) -> int:
+        """Add ``delta`` to the wallet and log it; returns the new balance.
+
+        Raises :class:`DuplicateInteraction` if ``interaction_id`` was
+        already applied.
+        """
+        with self._lock:
+            self._claim(interaction_id)
+            now = time.time()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute(
+                    "INSERT INTO wallets (user_id, balance) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance",
+                    (user_id, delta),
+                )
+                self._record(user_id, delta, kind, interaction_id, now)
+                balance = self._conn.execute("SELECT balance FROM wallets WHERE user_id = ?", (user_id,)).fetchone()[0]
+            if interaction_id is not None:
+                self.dedupe.add(interaction_id)
+            return balance
+
+    def claim_daily(self, user_id: int, amount: int, cooldown: float, interaction_id: Optional[int] = None) -> Tuple[bool, int, float]:
+        """Credit the daily bonus if the cooldown has passed.
+
+        Returns ``(claimed, balance, next_claim_at)``.
+        """
+        with self._lock:
+            self._claim(interaction_id)
+            now = time.time()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT balance, last_daily FROM wallets WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                balance, last = row if row else (0, None)
+                if last is not None and now - last < cooldown:
+                    return False, balance, last + cooldown
+                self._conn.execute(
+                    "INSERT INTO wallets (user_id, balance, last_daily) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance, "
+                    "last_daily = excluded.last_daily",
+                    (user_id, amount, now),
+                )
+                self._record(user_id, amount, "daily", interaction_id, now)
+            if interaction_id is not None:
+                self.dedupe.add(interaction_id)
+            return True, balance + amount, now + cooldown
+
+    def settle_wager(
+        self,
+        user_id: int,
+        stake: int,
+        payout: int,
+        kind: str,
+        interaction_id: Optional[int] = None,
+        cut: int = 0,
+    ) -> int:
+        """Debit ``stake`` and credit ``payout`` in one conditional update.
+
+        The debit only happens if the balance covers the stake, so there is
+        no separate balance read beforehand.  ``cut`` is the jackpot's share
+        of the bet: a win is credited ``payout - cut``, and on a loss it is
+        part of the forfeited stake.  Either way no coins are created.  The
+        cut is recorded in the ledger row.  Returns the new balance or raises
+        :class:`InsufficientFunds`.
+        """
+        return self._settle(user_id, stake, payout, kind, interaction_id, cut, None)[0]
+
+    def settle_jackpot_win(
+        self,
+        user_id: int,
+        stake: int,
+        payout: int,
+        kind: str,
+        interaction_id: Optional[int],
+        cut: int,
+        pending: int,
+    ) -> Tuple[int, int]:
+        """Settle a jackpot-winning wager and pay out the pot in one transaction.
+
+        The winner gets the stored pot plus ``pending`` (contributions not
+        yet flushed) and the pot is reset; if anything fails the wager is
+        not settled either.  Returns ``(balance, won)``.
+        """
+        return self._settle(user_id, stake, payout, kind, interaction_id, cut, pending)
+
+    def _settle(
+        self,
+        user_id: int,
+        stake: int,
+        payout: int,
+        kind: str,
+        interaction_id: Optional[int],
+        cut: int,
+        jackpot_pending: Optional[int],
+    ) -> Tuple[int, int]:
+        with self._lock:
+            self._claim(interaction_id)
+            now = time.time()
+            won = 0
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                credit = payout - cut if payout else 0
+                updated = self._conn.execute(
+                    "UPDATE wallets SET balance = balance - ? + ? WHERE user_id = ? AND balance >= ?",
+                    (stake, credit, user_id, stake),
+                ).rowcount
+                if updated:
+                    self._record(user_id, credit - stake, kind, interaction_id, now, stake, cut)
+                    if jackpot_pending is not None:
+                        won = self._conn.execute("SELECT amount FROM jackpot WHERE id = 1").fetchone()[0]
+                        won += jackpot_pending
+                        self._conn.execute("UPDATE jackpot SET amount = 0 WHERE id = 1")
+                        self._conn.execute("UPDATE wallets SET balance = balance + ? WHERE user_id = ?", (won, user_id))
+                        self._record(user_id, won, "jackpot", interaction_id, now)
+                row = self._conn.execute("SELECT balance FROM wallets WHERE user_id = ?", (user_id,)).fetchone()
+                balance = row[0] if row else 0
+                if not updated:
+                    raise InsufficientFunds(balance)
+            if interaction_id is not None:
+                self.dedupe.add(interaction_id)
+            return balance, won
+
+    def credit_batch(self, kind: str, credits: Sequence[Tuple[int, int, int]], refund: bool = False) -> None:
+        """Credit many wallets in one transaction, e.g. a whole table round.
+
+        ``credits`` is a sequence of ``(user_id, amount, cut)``; the stakes
+        were already debited when the bets were placed, and ``cut`` is the
+        jackpot share already taken out of ``amount`` (or of the lost
+        stake).  The cuts are added to the stored pot in the same
+        transaction.  With ``refund`` the entries reverse those stakes, so
+        the ledger's wagered totals stay correct.
+        """
+        pot_cut = sum(cut for _, _, cut in credits)
+        with self._lock:
+            now = time.time()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT INTO wallets (user_id, balance) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance",
+                    [(user_id, amount) for user_id, amount, _ in credits],
+                )
+                self._conn.executemany(
+                    "INSERT INTO transactions (user_id, delta, stake, cut, kind, interaction_id, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, NULL, ?)",
+                    ((user_id, amount, -amount if refund else 0, cut, kind, now) for user_id, amount, cut in credits),
+                )
+                if pot_cut:
+                    self._conn.execute("UPDATE jackpot SET amount = amount + ? WHERE id = 1", (pot_cut,))
+
+    def get_jackpot(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT amount FROM jackpot WHERE id = 1").fetchone()[0]
+
+    def add_jackpot(self, amount: int) -> int:
+        """Merge ``amount`` into the stored pot; returns the new pot"""
+        with self._lock:
+            if amount:
+                self._conn.execute("UPDATE jackpot SET amount = amount + ? WHERE id = 1", (amount,))
+            return self._conn.execute("SELECT amount FROM jackpot WHERE id = 1").fetchone()[0]
+
+    def reconcile_jackpot(self) -> Tuple[int, int]:
+        """Reset the stored pot to what the ledger says it holds.
+
+        The pot is every recorded cut minus every jackpot payout, so cuts
+        that were settled but never flushed (e.g. lost in a crash) are
+        recovered.  Returns ``(stored, recovered)``.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                stored = self._conn.execute("SELECT amount FROM jackpot WHERE id = 1").fetchone()[0]
+                recovered = self._conn.execute(
+                    "SELECT COALESCE(SUM(cut), 0) - COALESCE(SUM(CASE WHEN kind = 'jackpot' THEN delta END), 0) "
+                    "FROM transactions"
+                ).fetchone()[0]
+                self._conn.execute("UPDATE jackpot SET amount = ? WHERE id = 1", (recovered,))
+            return stored, recovered
+
+    # ──────────────────────────────────────────────
+    # 非同期 API (イベントループをブロックしない)
+    # ──────────────────────────────────────────────
+
+    async def run(self, method: Union[str, Callable[..., Any]], *args: Any) -> Any:
+        """Run a sync store method (by name) or store-bound callable in a worker thread"""
+        self.round_trips += 1
+        func = getattr(self, method) if isinstance(method, str) else method
+        return await asyncio.to_thread(func, *args)
+
+
+def get_store(bot: Any) -> WalletStore:
+    """Return the bot-wide :class:`WalletStore`, creating it on first use"""
+    store = getattr(bot, "wallet_store", None)
+    if store is None:
+        store = WalletStore()
+        bot.wallet_store = store
+    return store
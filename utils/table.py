@@ -0,0 +1,84 @@
+"""Shared dice table: many bets, one roll, one batched settlement"""
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from utils.helpers import create_embed
+
+SIDES = ("over", "under")  # over: 51-100, under: 1-50
+
+
+class TableBet:
+    def __init__(self, user_id: int, name: str, side: str, stake: int) -> None:
+        self.user_id = user_id
+        self.name = name
+        self.side = side
+        self.stake = stake
+        self.payout = 0
+        self.cut = 0
+        self.confirmed = False  # stake has been reserved
+
+
+class TableRound:
+    """Bets placed at one channel's table during a countdown"""
+
+    def __init__(self, channel_id: int, closes_at: float) -> None:
+        self.channel_id = channel_id
+        self.closes_at = closes_at
+        self.bets: Dict[int, TableBet] = {}
+        self.roll: Optional[int] = None
+        self.closed = False
+
+    def add(self, bet: TableBet) -> None:
+        self.bets[bet.user_id] = bet
+
+    def close(self) -> None:
+        """Stop taking bets and drop seats whose stake never got reserved"""
+        self.closed = True
+        self.bets = {uid: bet for uid, bet in self.bets.items() if bet.confirmed}
+
+    @property
+    def pot(self) -> int:
+        return sum(bet.stake for bet in self.bets.values())
+
+    def resolve(
+        self, roll: Optional[int] = None, cut: Callable[[int], int] = lambda stake: 0
+    ) -> List[Tuple[int, int, int]]:
+        """Roll once for everyone; returns ``(user_id, payout, cut)`` credits.
+
+        ``cut`` gives the jackpot's share of a stake: it is taken out of a
+        win, or out of the lost stake.  Losers with a non-zero cut are
+        included (with a zero payout) so the cut is recorded in the ledger.
+        """
+        self.roll = roll if roll is not None else random.randint(1, 100)
+        winning = "over" if self.roll > 50 else "under"
+        credits = []
+        for bet in self.bets.values():
+            bet.cut = cut(bet.stake)
+            bet.payout = bet.stake * 2 - bet.cut if bet.side == winning else 0
+            if bet.payout or bet.cut:
+                credits.append((bet.user_id, bet.payout, bet.cut))
+        return credits
+
+    def render(self, page_size: int = 20) -> List[discord.Embed]:
+        """Results as one or more embeds of ``page_size`` players each"""
+        bets = sorted(self.bets.values(), key=lambda b: b.payout - b.stake, reverse=True)
+        winners = sum(1 for b in bets if b.payout)
+        paid = sum(b.payout for b in bets)
+        header = (
+            f"The dice shows **{self.roll}** — **{'OVER' if self.roll > 50 else 'UNDER'}** wins!\n"
+            f"{len(bets):,} players · {winners:,} winners · pot {self.pot:,} · paid {paid:,}\n\n"
+        )
+        pages = []
+        for start in range(0, max(1, len(bets)), page_size):
+            lines = [
+                f"{'✅' if b.payout else '❌'} {b.name} ({b.side}, {b.stake:,}) → "
+                f"{'+' if b.payout else '-'}{(b.payout - b.stake if b.payout else b.stake):,}"
+                for b in bets[start:start + page_size]
+            ]
+            color = discord.Color.green() if winners else discord.Color.red()
+            pages.append(create_embed("🎲 Dice Table Results", header + "\n".join(lines), color))
+        return pages
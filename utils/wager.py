@@ -0,0 +1,106 @@
+"""Shared wager pipeline: validate → reserve → resolve → settle → render"""
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
+
+import discord
+
+from utils.helpers import create_embed, format_error
+from utils.jackpot import Jackpot
+from utils.respond import AdaptiveResponder, Reply
+from utils.storage import DuplicateInteraction, InsufficientFunds, WalletStore
+
+
+class WagerOutcome:
+    """Result of resolving one bet, before it touches the wallet"""
+
+    def __init__(
+        self,
+        payout: int,
+        title: str,
+        description: str,
+        fields: Optional[List[Tuple[str, str]]] = None,
+        jackpot: bool = False,
+    ):
+        self.payout = payout
+        self.title = title
+        self.description = description
+        self.fields = fields or []
+        self.jackpot = jackpot
+
+
+Resolver = Callable[[int], WagerOutcome]
+
+
+class WagerPipeline:
+    """Runs a game's resolve function inside the common bet lifecycle.
+
+    Games only decide the outcome; stake validation, settlement and the
+    response embed are shared.  Reserve and settle are a single conditional
+    debit-and-credit (:meth:`WalletStore.settle_wager`), so a bet costs one
+    storage round trip and cannot overdraw the wallet under concurrency.
+    Each bet's jackpot cut is settled in that same transaction and then
+    fed to the progressive ``jackpot`` in memory; a jackpot win is paid
+    inside the winning bet's transaction too.  Replies go through the
+    ``responder``, which defers only when storage is running slow.
+    """
+
+    def __init__(self, store: WalletStore, responder: AdaptiveResponder, jackpot: Optional[Jackpot] = None) -> None:
+        self.store = store
+        self.responder = responder
+        self.jackpot = jackpot
+
+    def validate(self, bet: int) -> str:
+        """Return an error message for an invalid stake, or an empty string"""
+        if bet <= 0:
+            return "Bet must be positive."
+        return ""
+
+    def render(self, bet: int, outcome: WagerOutcome, balance: int, cut: int = 0) -> discord.Embed:
+        net = outcome.payout - bet
+        color = discord.Color.green() if net > 0 else (discord.Color.light_grey() if net == 0 else discord.Color.red())
+        embed = create_embed(outcome.title, outcome.description, color)
+        for name, value in outcome.fields:
+            embed.add_field(name=name, value=value)
+        if outcome.payout and cut:
+            embed.add_field(name="Payout", value=f"{outcome.payout - cut:,} coins ({cut:,} to the jackpot)")
+        else:
+            embed.add_field(name="Payout", value=f"{outcome.payout:,} coins")
+        embed.add_field(name="Balance", value=f"{balance:,} coins")
+        return embed
+
+    async def play(self, interaction: discord.Interaction, game: str, bet: int, resolve: Resolver) -> None:
+        error = self.validate(bet)
+        if error:
+            await interaction.response.send_message(embed=format_error(error), ephemeral=True)
+            return
+        await self.responder.send(interaction, game, lambda: self._settle(interaction, game, bet, resolve))
+
+    async def _settle(self, interaction: discord.Interaction, game: str, bet: int, resolve: Resolver) -> Optional[Reply]:
+        # The outcome never depends on the balance, so resolve before the
+        # single settle call instead of reading the wallet first.
+        outcome = resolve(bet)
+        user_id = interaction.user.id
+        cut = won = 0
+        try:
+            if self.jackpot is not None and outcome.jackpot:
+                # The pot is paid in the same transaction as the winning bet
+                balance, won, cut = await self.store.run(
+                    self.jackpot.settle_win, user_id, bet, outcome.payout, game, interaction.id
+                )
+            elif self.jackpot is not None:
+                balance, cut = await self.store.run(
+                    self.jackpot.settle, user_id, bet, outcome.payout, game, interaction.id
+                )
+            else:
+                cut = 0
+                balance = await self.store.run("settle_wager", user_id, bet, outcome.payout, game, interaction.id)
+        except DuplicateInteraction:
+            # A replayed interaction, or (rarely) a Bloom-filter false
+            # positive: answer anyway so Discord doesn't show a timeout.
+            return {"embed": format_error("This command was already processed."), "ephemeral": True}
+        except InsufficientFunds as e:
+            return {"embed": format_error(f"Not enough coins (you have **{e.balance:,}**)."), "ephemeral": True}
+        if won:
+            outcome.fields.append(("💰 JACKPOT", f"+{won:,} coins"))
+        return {"embed": self.render(bet, outcome, balance, cut)}